@@ -1,10 +1,33 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, Response, stream_with_context, g
 from flask_login import LoginManager, login_user, login_required, logout_user, UserMixin, current_user
 from flask_bcrypt import Bcrypt
+from flask_compress import Compress
+from cachetools import TTLCache
+from contextlib import contextmanager
+from functools import lru_cache
+import hashlib
+import hmac
+import orjson
+import os
+import threading
+import time
 import mysql.connector
+from sqlalchemy import create_engine
 
 app = Flask(__name__)
 app.secret_key = "supersecret"
+# bcrypt cost: each +1 doubles hashing time. Raising it is safe — older hashes
+# are upgraded transparently on the user's next successful login.
+app.config["BCRYPT_LOG_ROUNDS"] = 12
+
+# ---- Response Compression ----
+# Article bodies dominate /api/articles and index payloads and compress 5-10x
+app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+app.config["COMPRESS_ALGORITHM_STREAMING"] = ["br", "deflate"]
+app.config["COMPRESS_MIN_SIZE"] = 1024
+app.config["COMPRESS_LEVEL"] = 4
+app.config["COMPRESS_BR_LEVEL"] = 4
+Compress(app)
 
 # ---- MySQL Config ----
 db_config = {
@@ -14,7 +37,39 @@ db_config = {
     "database": "insightbot"
 }
 
+# ---- Connection Pool ----
+# SQLAlchemy QueuePool: pre_ping replaces connections the server has dropped, recycle
+# retires them before MySQL's wait_timeout, and engine.pool.status() exposes usage.
+# Connections are built by mysql.connector itself: the dialect's own connect args force
+# buffered=True (which silently makes every cursor buffered) and ClientFlag.FOUND_ROWS
+# (which makes rowcount report matched instead of changed rows).
+engine = create_engine(
+    "mysql+mysqlconnector://",
+    creator=lambda: mysql.connector.connect(**db_config),
+    pool_size=10, max_overflow=20, pool_pre_ping=True, pool_recycle=1800,
+)
+
+@contextmanager
+def get_conn():
+    # Raw DBAPI connection from the pool, so routes use mysql.connector cursors directly
+    # (unbuffered ones stream rows instead of loading the whole result set)
+    conn = engine.raw_connection()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
 bcrypt = Bcrypt(app)
+# Verified against when the username is unknown so both paths pay the same bcrypt cost
+DUMMY_HASH = bcrypt.generate_password_hash("x" * 12).decode("utf-8")
+
+def needs_rehash(pw_hash):
+    # bcrypt hashes look like $2b$12$..., the cost is the two digits after the prefix
+    try:
+        return int(pw_hash[4:6]) < app.config["BCRYPT_LOG_ROUNDS"]
+    except ValueError:
+        return False
+
 login_manager = LoginManager(app)
 login_manager.login_view = "login"
 
@@ -26,16 +81,36 @@ class User(UserMixin):
         self.is_admin = is_admin
         self.is_approved = is_approved
 
+# Cross-request cache of loaded users, keyed by str(user_id); TTLCache is not thread-safe
+USER_CACHE = TTLCache(maxsize=1024, ttl=30)
+USER_CACHE_LOCK = threading.Lock()
+
+def invalidate_user(user_id):
+    with USER_CACHE_LOCK:
+        USER_CACHE.pop(str(user_id), None)
+
 @login_manager.user_loader
 def load_user(user_id):
-    conn = mysql.connector.connect(**db_config)
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM users WHERE id = %s", (user_id,))
-    user = cursor.fetchone()
-    conn.close()
-    if user:
-        return User(user["id"], user["username"], user["is_admin"], user["is_approved"])
-    return None
+    user_id = str(user_id)
+    if "user_cache" not in g:
+        g.user_cache = {}
+    if user_id in g.user_cache:
+        return g.user_cache[user_id]
+
+    with USER_CACHE_LOCK:
+        user_obj = USER_CACHE.get(user_id)
+    if user_obj is None:
+        with get_conn() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("SELECT id, username, is_admin, is_approved FROM users WHERE id = %s", (user_id,))
+            user = cursor.fetchone()
+        if user:
+            user_obj = User(user["id"], user["username"], user["is_admin"], user["is_approved"])
+            with USER_CACHE_LOCK:
+                USER_CACHE[user_id] = user_obj
+
+    g.user_cache[user_id] = user_obj
+    return user_obj
 
 # ---- Routes ----
 
@@ -46,19 +121,18 @@ def register():
         password = request.form["password"]
         email = request.form.get("email")
 
-        conn = mysql.connector.connect(**db_config)
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM users WHERE username = %s", (username,))
-        if cursor.fetchone():
-            conn.close()
-            flash("Username already exists")
-            return redirect(url_for("register"))
-
         pw_hash = bcrypt.generate_password_hash(password).decode("utf-8")
-        cursor.execute("INSERT INTO users (username, password_hash, email) VALUES (%s, %s, %s)",
-                       (username, pw_hash, email))
-        conn.commit()
-        conn.close()
+        with get_conn() as conn:
+            cursor = conn.cursor()
+            # relies on UNIQUE(username): a duplicate is a no-op and reports rowcount 0
+            cursor.execute("""
+                INSERT INTO users (username, password_hash, email) VALUES (%s, %s, %s)
+                ON DUPLICATE KEY UPDATE id = id
+            """, (username, pw_hash, email))
+            conn.commit()
+            if cursor.rowcount == 0:
+                flash("Username already exists")
+                return redirect(url_for("register"))
         flash("Registered successfully. Wait for admin approval.")
         return redirect(url_for("login"))
     return render_template("register.html")
@@ -69,16 +143,27 @@ def login():
         username = request.form["username"]
         password = request.form["password"]
 
-        conn = mysql.connector.connect(**db_config)
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM users WHERE username = %s", (username,))
-        user = cursor.fetchone()
-        conn.close()
+        with get_conn() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("SELECT id, username, password_hash, is_admin, is_approved "
+                           "FROM users WHERE username = %s", (username,))
+            user = cursor.fetchone()
+
+        hash_to_check = user["password_hash"] if user else DUMMY_HASH
+        ok = bcrypt.check_password_hash(hash_to_check, password)
+        valid = user is not None and hmac.compare_digest(b"1" if ok else b"0", b"1")
 
-        if user and bcrypt.check_password_hash(user["password_hash"], password):
+        if valid:
             if not user["is_approved"]:
                 flash("Your account is pending admin approval.")
                 return redirect(url_for("login"))
+            if needs_rehash(user["password_hash"]):
+                new_hash = bcrypt.generate_password_hash(password).decode("utf-8")
+                with get_conn() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute("UPDATE users SET password_hash = %s WHERE id = %s",
+                                   (new_hash, user["id"]))
+                    conn.commit()
             login_user(User(user["id"], user["username"], user["is_admin"], user["is_approved"]))
             return redirect(url_for("index"))
         else:
@@ -91,65 +176,144 @@ def logout():
     logout_user()
     return redirect(url_for("login"))
 
+# Most ids one "Approve all" request may carry; the page sends the first batch_max pending users
+APPROVE_BATCH_MAX = 500
+
 @app.route("/admin/approve")
 @login_required
 def admin_approve():
     if not current_user.is_admin:
         return "Access denied", 403
-    conn = mysql.connector.connect(**db_config)
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM users WHERE is_approved = FALSE")
-    users = cursor.fetchall()
-    conn.close()
-    return render_template("approve.html", users=users)
+    with get_conn() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT id, username, email FROM users WHERE is_approved = FALSE")
+        users = cursor.fetchall()
+    return render_template("approve.html", users=users, batch_max=APPROVE_BATCH_MAX)
 
 @app.route("/admin/approve/<int:user_id>")
 @login_required
 def approve_user(user_id):
     if not current_user.is_admin:
         return "Access denied", 403
-    conn = mysql.connector.connect(**db_config)
-    cursor = conn.cursor()
-    cursor.execute("UPDATE users SET is_approved = TRUE WHERE id = %s", (user_id,))
-    conn.commit()
-    conn.close()
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE users SET is_approved = TRUE WHERE id = %s", (user_id,))
+        conn.commit()
+    invalidate_user(user_id)
     flash("User approved successfully!")
     return redirect(url_for("admin_approve"))
 
+@app.route("/admin/approve/batch", methods=["POST"])
+@login_required
+def approve_users_batch():
+    if not current_user.is_admin:
+        return "Access denied", 403
+    data = request.get_json(silent=True)
+    ids = data.get("ids", []) if isinstance(data, dict) else None
+    # bool is an int subclass and int("12") parses, so accept real integers only
+    if (not isinstance(ids, list) or len(ids) > APPROVE_BATCH_MAX
+            or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids)):
+        return jsonify({"error": f"ids must be a list of at most {APPROVE_BATCH_MAX} integers"}), 400
+    ids = sorted(set(ids))
+    if not ids:
+        return jsonify({"approved": 0})
+
+    placeholders = ",".join(["%s"] * len(ids))
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"UPDATE users SET is_approved = TRUE WHERE id IN ({placeholders})", ids)
+        approved = cursor.rowcount
+        conn.commit()
+    for user_id in ids:
+        invalidate_user(user_id)
+    return jsonify({"approved": approved})
+
+ARTICLES_PER_PAGE = 50
+
+# Language facet list and per-language article counts change only when the scraper runs
+FACET_CACHE = TTLCache(maxsize=64, ttl=60)
+FACET_CACHE_LOCK = threading.Lock()
+
+def _cached_facet(key, compute):
+    with FACET_CACHE_LOCK:
+        if key in FACET_CACHE:
+            return FACET_CACHE[key]
+    value = compute()
+    with FACET_CACHE_LOCK:
+        FACET_CACHE[key] = value
+    return value
+
+def get_languages():
+    def compute():
+        with get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT DISTINCT language FROM articles WHERE language IS NOT NULL")
+            return [lang for (lang,) in cursor.fetchall() if lang]
+    return _cached_facet("languages", compute)
+
+def get_article_count(language=None):
+    def compute():
+        with get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM articles WHERE (%s IS NULL OR language = %s)",
+                           (language, language))
+            return cursor.fetchone()[0]
+    return _cached_facet(("count", language), compute)
+
 @app.route("/", methods=["GET"])
 @login_required
 def index():
-    conn = mysql.connector.connect(**db_config)
-    cursor = conn.cursor(dictionary=True)
+    selected_lang = request.args.get("lang") or None
+    page = max(request.args.get("page", 1, type=int), 1)
 
-    cursor.execute("SELECT * FROM articles ORDER BY id DESC")
-    rows = cursor.fetchall()
-    conn.close()
+    with get_conn() as conn:
+        cursor = conn.cursor(dictionary=True, buffered=False)
+        cursor.execute("""
+            SELECT id, title, LEFT(body, 200) AS body, published, source, language
+            FROM articles
+            WHERE (%s IS NULL OR language = %s)
+            ORDER BY id DESC
+            LIMIT %s OFFSET %s
+        """, (selected_lang, selected_lang, ARTICLES_PER_PAGE, (page - 1) * ARTICLES_PER_PAGE))
+        rows = cursor.fetchall()
 
-    if not rows:
+    if not rows and not selected_lang and page == 1:
         return "No articles available yet."
 
-    selected_lang = request.args.get("lang")
-    if selected_lang:
-        filtered = [row for row in rows if row["language"] == selected_lang]
-    else:
-        filtered = rows
-
-    languages = list({row["language"] for row in rows if row["language"]})
+    total = get_article_count(selected_lang)
     return render_template("index.html",
-                           articles=filtered,
-                           languages=languages,
-                           selected_lang=selected_lang)
+                           articles=rows,
+                           languages=get_languages(),
+                           selected_lang=selected_lang,
+                           total=total,
+                           page=page,
+                           has_next=page * ARTICLES_PER_PAGE < total)
+
+# Hot articles served from memory. LRU-evicting, with a TTL because the scraper can
+# upsert an existing article; misses are not cached so new ids show up immediately.
+ARTICLE_CACHE = TTLCache(maxsize=4096, ttl=600)
+ARTICLE_CACHE_LOCK = threading.Lock()
+
+def get_article(article_id):
+    with ARTICLE_CACHE_LOCK:
+        row = ARTICLE_CACHE.get(article_id)
+    if row is not None:
+        return row
+    with get_conn() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT id, url, title, body, published, source, language "
+                       "FROM articles WHERE id = %s", (article_id,))
+        row = cursor.fetchone()
+    if row:
+        row = dict(row)
+        with ARTICLE_CACHE_LOCK:
+            ARTICLE_CACHE[article_id] = row
+    return row
 
 @app.route("/article/<int:article_id>")
 @login_required
 def article(article_id):
-    conn = mysql.connector.connect(**db_config)
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM articles WHERE id = %s", (article_id,))
-    row = cursor.fetchone()
-    conn.close()
-
+    row = get_article(article_id)
     if not row:
         return "Article not found", 404
 
@@ -161,24 +325,95 @@ def article(article_id):
 def dashboard():
     return render_template("dashboard.html")
 
+API_DEFAULT_LIMIT = 100
+API_MAX_LIMIT = 500
+STREAM_BATCH_SIZE = 512
+
+API_VERSION_TTL = 5  # seconds
+
+@lru_cache(maxsize=1)
+def _articles_version(ttl_bucket):
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT MAX(id), MAX(updated_at) FROM articles")
+        return cursor.fetchone()
+
+def _api_response(resp, etag, last_modified):
+    resp.set_etag(etag)
+    if last_modified:
+        resp.last_modified = last_modified
+    resp.headers["Cache-Control"] = "public, max-age=30"
+    return resp
+
 @app.route('/api/articles')
 def api_articles():
-    conn = mysql.connector.connect(
-        host="localhost", user="root", password="", database="insightbot"
-    )
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("""
-        SELECT id, url, title, body, published, length, source, language
-        FROM articles
-    """)
-    rows = cursor.fetchall()
-    conn.close()
-    return jsonify(rows)
+    after_id = request.args.get("after_id", type=int)
+    limit = request.args.get("limit", type=int)
+
+    # Conditional GET: the table only changes when the scraper runs
+    max_id, max_ts = _articles_version(int(time.time() // API_VERSION_TTL))
+    etag = hashlib.blake2b(f"{max_id}:{max_ts}:{request.query_string.decode()}".encode(),
+                           digest_size=8).hexdigest()
+    # Flask-Compress appends the encoding to strong ETags ("<etag>:br"), so compare the base tag
+    if any(tag.split(":")[0] == etag for tag in request.if_none_match.as_set()):
+        return _api_response(Response(status=304), etag, max_ts)
+
+    # Full export (the Tableau WDC): stream rows straight off an unbuffered cursor
+    if after_id is None and limit is None:
+        def gen():
+            with get_conn() as conn:
+                cursor = conn.cursor(dictionary=True, buffered=False)
+                cursor.execute("""
+                    SELECT id, url, title, body, published, length, source, language
+                    FROM articles
+                    ORDER BY id DESC
+                """)
+                try:
+                    yield b"["
+                    first = True
+                    while True:
+                        batch = cursor.fetchmany(STREAM_BATCH_SIZE)
+                        if not batch:
+                            break
+                        for row in batch:
+                            yield (b"" if first else b",") + orjson.dumps(row, option=orjson.OPT_NAIVE_UTC)
+                            first = False
+                    yield b"]"
+                finally:
+                    # client may disconnect mid-stream; drain so the pooled connection is reusable
+                    conn.consume_results()
+        return _api_response(Response(stream_with_context(gen()), mimetype="application/json"),
+                             etag, max_ts)
+
+    # Keyset page: ?after_id=<last id seen>&limit=<n>
+    limit = min(max(limit or API_DEFAULT_LIMIT, 1), API_MAX_LIMIT)
+    with get_conn() as conn:
+        cursor = conn.cursor(dictionary=True, buffered=False)
+        cursor.execute("""
+            SELECT id, url, title, body, published, length, source, language
+            FROM articles
+            WHERE (%s IS NULL OR id < %s)
+            ORDER BY id DESC
+            LIMIT %s
+        """, (after_id, after_id, limit))
+        rows = cursor.fetchall()
+    return _api_response(Response(orjson.dumps(rows, option=orjson.OPT_NAIVE_UTC),
+                                  mimetype="application/json"),
+                         etag, max_ts)
+
 
+@app.route("/health")
+def health():
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+    return jsonify({"db": "ok", "pool": engine.pool.status()})
 
 @app.route("/tableau_wdc")
 def tableau_wdc():
     return render_template("tableau_wdc.html")
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    # Development server only; serve production traffic with `gunicorn app:app` (see gunicorn.conf.py)
+    app.run(debug=os.environ.get("FLASK_DEBUG") == "1", threaded=True)
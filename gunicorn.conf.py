@@ -0,0 +1,19 @@
+# Gunicorn settings for serving InsightBot (picked up automatically by `gunicorn app:app`)
+import multiprocessing
+
+bind = "127.0.0.1:5000"
+
+# One process per core, each with a thread pool; bcrypt releases the GIL so
+# logins/registrations hash in parallel instead of serializing the server
+workers = multiprocessing.cpu_count()
+worker_class = "gthread"
+threads = 8
+
+# Import the app once in the master and fork it. The SQLAlchemy pool connects lazily,
+# but drop any inherited pool state in each worker so sockets are never shared.
+preload_app = True
+
+
+def post_fork(server, worker):
+    from app import engine
+    engine.dispose(close=False)
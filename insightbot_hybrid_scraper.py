@@ -1,20 +1,28 @@
 
 import argparse
-import json
+import asyncio
+import codecs
+import csv
+import functools
+import hashlib
 import logging
-import math
 import random
 import re
 import time
-from datetime import timezone
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
 import schedule
 
-import mysql.connector
-import pandas as pd
-import requests
-from bs4 import BeautifulSoup
+import aiohttp
+from mysql.connector import pooling
+import orjson
 from dateutil import parser as dateparser, tz
+import fasttext
 from langdetect import detect, DetectorFactory
+import lxml.html
+import trafilatura
+from lxml import etree
+from lxml.cssselect import CSSSelector
 from urllib.parse import urljoin, urlparse
 
 DetectorFactory.seed = 0
@@ -52,6 +60,18 @@ HEADERS_POOL = [
     "Chrome/88.0.4324.96 Safari/537.36",
 ]
 
+# fastText language-id model, download from
+# https://dl.fbaipublicfiles.com/fasttext/supervised-models/lid.176.ftz
+LID_MODEL_PATH = "lid.176.ftz"
+LID_SAMPLE_CHARS = 2000  # accuracy saturates well before this
+
+# HTTP connection pool
+HTTP_POOL_SIZE = 64
+HTTP_PER_HOST = 4
+# pages are truncated here; article markup never needs more
+MAX_BYTES = 524288
+READ_CHUNK = 65536
+
 # timezone hints for ambiguous tz abbreviations
 TZINFOS = {
     "EST": tz.gettz("America/New_York"),
@@ -76,6 +96,15 @@ BAD_PHRASES = [
     "follow us", "share this", "advertisement", "sponsored content",
     "recommended", "read more", "watch:", "photo:", "video:"
 ]
+# each list folded into one alternation so a single C-level scan replaces any(... in ...)
+BAD_SUBSTR_RE = re.compile("|".join(map(re.escape, BAD_SUBSTRINGS)))
+SECTION_RE = re.compile("|".join(map(re.escape, SECTION_HINTS)))
+POSITIVE_RE = re.compile("|".join(map(re.escape, POSITIVE_SIGNS)))
+BAD_PHRASE_RE = re.compile("|".join(map(re.escape, BAD_PHRASES)))
+DATE_PATH_RE = re.compile(r"/\d{4}/\d{2}/\d{2}/")
+ISO_TS_RE = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}")
+TITLE_TAIL_RE = re.compile(r"\s+[–\-—|•·]\s+.*$")  # " - Site Name" suffix on titles
+MYSQL_DT_RE = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}")  # normalize_date_to_mysql output
 
 # ---------- Logging ----------
 logging.basicConfig(
@@ -84,35 +113,101 @@ logging.basicConfig(
     handlers=[logging.FileHandler("scraper.log"), logging.StreamHandler()]
 )
 
+# ---------- Language detection ----------
+def load_lid_model(path=LID_MODEL_PATH):
+    try:
+        return fasttext.load_model(path)
+    except ValueError:
+        logging.warning("fastText model %s not found, falling back to langdetect", path)
+        return None
+
+# loaded once at import; detection runs in the main process after scraping
+LID = load_lid_model()
+
+def detect_languages(texts):
+    """Return a language code per text ("unknown" where it cannot be detected)"""
+    samples = [text[:LID_SAMPLE_CHARS].replace("\n", " ") if text else "" for text in texts]
+    if LID is None:
+        codes = []
+        for sample in samples:
+            try:
+                codes.append(detect(sample) if sample else "unknown")
+            except Exception:
+                codes.append("unknown")
+        return codes
+    try:
+        # one vectorized call for the whole batch; list input also sidesteps
+        # fasttext's single-string predict, which breaks under numpy 2
+        labels, _ = LID.predict(samples, k=1)
+    except Exception:
+        return ["unknown"] * len(samples)
+    return [label[0].replace("__label__", "") if sample else "unknown"
+            for sample, label in zip(samples, labels)]
+
 # ---------- Helpers ----------
 def pick_user_agent():
     return random.choice(HEADERS_POOL)
 
-def fetch_url(session, url, retries=2, timeout=12):
+def make_session():
+    """Pooled HTTP session shared by every fetch in a run (call inside the event loop)"""
+    # keep-alive sockets and cached DNS are reused across homepage and article fetches;
+    # the pool is sized above peak concurrency (sites x limit_per_host) so fetches never
+    # queue for a connection, while limit_per_host keeps us polite to each site
+    connector = aiohttp.TCPConnector(limit=HTTP_POOL_SIZE, limit_per_host=HTTP_PER_HOST,
+                                     ttl_dns_cache=300, keepalive_timeout=30)
+    return aiohttp.ClientSession(connector=connector, headers={"User-Agent": pick_user_agent()})
+
+def response_codec(charset):
+    """Codec for a Content-Type charset label, utf-8 when it is missing or unknown"""
+    if charset:
+        try:
+            return codecs.lookup(charset).name
+        except LookupError:
+            pass
+    return "utf-8"
+
+async def fetch_url(session, url, retries=2, timeout=12):
+    """Return the decoded page body, or None if every attempt fails"""
     for attempt in range(retries+1):
+        # the session carries a User-Agent; only rotate it when retrying
+        headers = {"User-Agent": pick_user_agent()} if attempt else None
         try:
-            session.headers.update({"User-Agent": pick_user_agent()})
-            r = session.get(url, timeout=timeout)
-            if r.status_code == 200:
-                return r
-            logging.warning("Non-200 %s for %s", r.status_code, url)
+            async with session.get(url, headers=headers,
+                                   timeout=aiohttp.ClientTimeout(total=timeout)) as r:
+                if r.status == 200:
+                    # stop reading once MAX_BYTES arrive; the rest is never downloaded
+                    body = bytearray()
+                    async for chunk in r.content.iter_chunked(READ_CHUNK):
+                        body += chunk
+                        if len(body) >= MAX_BYTES:
+                            break
+                    return body[:MAX_BYTES].decode(response_codec(r.charset), errors="replace")
+                logging.warning("Non-200 %s for %s", r.status, url)
         except Exception as e:
             logging.warning("Fetch error (%s) for %s", e, url)
-        time.sleep(1 + random.random())
+        await asyncio.sleep(1 + random.random())
     return None
 
+@functools.lru_cache(maxsize=8192)
 def normalize_domain(url):
     net = urlparse(url).netloc.lower()
     if net.startswith("www."):
         net = net[4:]
     return net
 
+def parse_date(text):
+    """Parse a date string: ISO 8601 via the C fast path, anything else via fuzzy dateutil"""
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return dateparser.parse(text, fuzzy=True, tzinfos=TZINFOS)
+
 def normalize_date_to_mysql(dt_raw):
     """Return a string 'YYYY-MM-DD HH:MM:SS' in UTC or None"""
     if not dt_raw:
         return None
     try:
-        dt = dateparser.parse(str(dt_raw), fuzzy=True, tzinfos=TZINFOS)
+        dt = parse_date(str(dt_raw))
         # if parsed but has no tzinfo, assume UTC
         if dt.tzinfo:
             dt_utc = dt.astimezone(timezone.utc)
@@ -122,60 +217,81 @@ def normalize_date_to_mysql(dt_raw):
     except Exception:
         return None
 
+# ---------- HTML parsing (lxml) ----------
+# XPaths are compiled once at import; lxml evaluates them in C
+TEXT_XPATH = etree.XPath(".//text()[not(ancestor::script or ancestor::style or ancestor::template)]")
+P_XPATH = etree.XPath(".//p")
+A_HREF_XPATH = etree.XPath(".//a[@href]")
+H1_XPATH = etree.XPath("//h1")
+HEADLINE_XPATH = etree.XPath("//h1|//h2")
+TIME_XPATH = etree.XPath("//time")
+META_XPATHS = {
+    "property": etree.XPath("//meta[@property=$value]"),
+    "name": etree.XPath("//meta[@name=$value]"),
+    "itemprop": etree.XPath("//meta[@itemprop=$value]"),
+}
+
+def css(sel):
+    """CSS selector translated to a compiled XPath once (HTML rules, as tree.cssselect uses)"""
+    return CSSSelector(sel, translator="html")
+
+ARTICLE_SEL = css("article")
+PROMO_LINK_SEL = css("a.card, a.promo, .headline a")
+DATE_SELS = [css(sel) for sel in ["span.pubdate", ".published-date", ".article-date", ".date", ".byline time", ".meta__date"]]
+
+def parse_html(html):
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        # str input carrying an XML encoding declaration must be parsed as bytes
+        return lxml.html.document_fromstring(html.encode("utf-8"))
+
+def first(nodes):
+    return nodes[0] if nodes else None
+
+def node_text(el):
+    """Whitespace-stripped text pieces of el joined by spaces (script/style excluded)"""
+    return " ".join(t.strip() for t in TEXT_XPATH(el) if t.strip())
+
+def find_meta(tree, attr, value):
+    return first(META_XPATHS[attr](tree, value=value))
+
+def select_one(tree, sel):
+    return first(sel(tree))
+
 # ---------- Title extraction & heuristics ----------
 def clean_title(text):
     if not text:
         return "N/A"
     t = " ".join(text.split())
-    return re.sub(r"\s+[–\-—|•·]\s+.*$", "", t).strip()
-
-def extract_title_generic(soup):
-    h1 = soup.find("h1")
-    if h1 and h1.get_text(strip=True):
-        return clean_title(h1.get_text(" ", strip=True))
-    meta = soup.find("meta", property="og:title") or soup.find("meta", attrs={"name":"twitter:title"})
-    if meta and meta.get("content"):
+    return TITLE_TAIL_RE.sub("", t).strip()
+
+def extract_title_generic(tree):
+    h1 = first(H1_XPATH(tree))
+    if h1 is not None:
+        h1_text = node_text(h1)
+        if h1_text:
+            return clean_title(h1_text)
+    meta = find_meta(tree, "property", "og:title")
+    if meta is None:
+        meta = find_meta(tree, "name", "twitter:title")
+    if meta is not None and meta.get("content"):
         return clean_title(meta.get("content"))
-    if soup.title and soup.title.string:
-        return clean_title(soup.title.string)
+    title = tree.findtext(".//title")
+    if title:
+        return clean_title(title)
     return "N/A"
 
-def score_container(el):
-    ps = el.find_all("p")
-    if not ps:
-        return 0
-    total_len = sum(len(p.get_text(" ", strip=True)) for p in ps)
-    num_p = len(ps)
-    num_a = len(el.find_all("a"))
-    score = total_len * (1 + math.log1p(num_p)) - (num_a * 30)
-    return score
-
-def find_best_container(soup, min_score=180):
-    candidates = []
-    for tag in ("article", "main", "section", "div"):
-        for el in soup.find_all(tag):
-            try:
-                s = score_container(el)
-                if s > 0:
-                    candidates.append((s, el))
-            except Exception:
-                continue
-    if not candidates:
-        return None
-    candidates.sort(key=lambda x: x[0], reverse=True)
-    best_score, best_el = candidates[0]
-    return best_el if best_score >= min_score else None
-
 def extract_paragraphs_from_el(el, min_len=40, max_paras=120):
     paras = []
-    if not el:
+    if el is None:
         return paras
-    for p in el.find_all("p"):
-        text = p.get_text(" ", strip=True)
+    for p in P_XPATH(el):
+        text = node_text(p)
         if len(text) < min_len:
             continue
         low = text.lower()
-        if any(bad in low for bad in BAD_PHRASES):
+        if BAD_PHRASE_RE.search(low):
             continue
         if len(text.split()) <= 6 and text.endswith(":"):
             continue
@@ -185,21 +301,28 @@ def extract_paragraphs_from_el(el, min_len=40, max_paras=120):
     return paras
 
 # ---------- Generic article extraction (fallback) ----------
-def extract_article_generic(session, url):
-    r = fetch_url(session, url)
-    if not r:
+# Extractors are pure (html, url) -> record functions so they can run in a worker process
+def extract_article_generic(html, url):
+    tree = parse_html(html)
+
+    # trafilatura finds title, main text and date in one pass over the tree (it works on a copy)
+    doc = trafilatura.bare_extraction(
+        tree,
+        url=url,
+        include_comments=False,
+        include_tables=False,
+        with_metadata=True,
+        favor_precision=True,
+    )
+    if doc is None:
+        logging.debug("No main content for %s", url)
         return None
-    soup = BeautifulSoup(r.text, "lxml")
-
-    title = extract_title_generic(soup)
-    container = find_best_container(soup)
-    body_paras = extract_paragraphs_from_el(container) if container else []
-
-    # final fallback: long <p>
-    if not body_paras:
-        all_ps = [p.get_text(" ", strip=True) for p in soup.find_all("p")]
-        body_paras = [p for p in all_ps if len(p) > 80][:120]
 
+    title = clean_title(doc.title) if doc.title else extract_title_generic(tree)
+    body_paras = [
+        line.strip() for line in (doc.text or "").splitlines()
+        if line.strip() and not BAD_PHRASE_RE.search(line.lower())
+    ]
     body_text = " ".join(body_paras).strip()
 
     if title == "N/A" or len(title.split()) < 3:
@@ -209,17 +332,11 @@ def extract_article_generic(session, url):
         logging.debug("Insufficient body for %s (paras=%d, len=%d)", url, len(body_paras), len(body_text))
         return None
 
-    # published detection (best-effort)
-    published = parse_published_generic(soup, url)
+    # meta tags carry the full timestamp; htmldate prefers URL dates and keeps only the day
+    published = parse_published_generic(tree, url, html) or doc.date
     published_norm = normalize_date_to_mysql(published)
 
-    lang = "unknown"
-    try:
-        if body_text:
-            lang = detect(body_text)
-    except Exception:
-        pass
-
+    # language is detected for the whole run at once in scrape_all
     return {
         "url": url,
         "title": title,
@@ -227,61 +344,64 @@ def extract_article_generic(session, url):
         "published": published_norm,
         "length": len(body_text),
         "source": normalize_domain(url),
-        "language": lang
+        "language": None
     }
 
 # ---------- Generic published parsing ----------
-def parse_published_generic(soup, url):
+def parse_published_generic(tree, url, html):
     texts = []
     meta_keys = [
-        ("meta", {"property":"article:published_time"}),
-        ("meta", {"name":"pubdate"}),
-        ("meta", {"name":"publish-date"}),
-        ("meta", {"name":"publication_date"}),
-        ("meta", {"itemprop":"datePublished"}),
-        ("meta", {"property":"og:updated_time"}),
-        ("meta", {"name":"date"}),
+        ("property", "article:published_time"),
+        ("name", "pubdate"),
+        ("name", "publish-date"),
+        ("name", "publication_date"),
+        ("itemprop", "datePublished"),
+        ("property", "og:updated_time"),
+        ("name", "date"),
     ]
-    for tag, attrs in meta_keys:
-        el = soup.find(tag, attrs=attrs)
-        if el:
-            val = el.get("content") or el.get("value") or el.get_text(" ", strip=True)
+    for attr, value in meta_keys:
+        el = find_meta(tree, attr, value)
+        if el is not None:
+            val = el.get("content") or el.get("value") or node_text(el)
             if val:
                 texts.append(val.strip())
 
-    for t in soup.find_all("time"):
+    for t in TIME_XPATH(tree):
         dt = t.get("datetime")
         if dt:
             texts.append(dt.strip())
         else:
-            txt = t.get_text(" ", strip=True)
+            txt = node_text(t)
             if txt:
                 texts.append(txt.strip())
 
-    for sel in ["span.pubdate", ".published-date", ".article-date", ".date", ".byline time", ".meta__date"]:
-        el = soup.select_one(sel)
-        if el:
-            txt = el.get("datetime") or el.get_text(" ", strip=True)
+    for sel in DATE_SELS:
+        el = select_one(tree, sel)
+        if el is not None:
+            txt = el.get("datetime") or node_text(el)
             if txt:
                 texts.append(txt.strip())
 
-    page_text = soup.get_text(" ", strip=True)
-    m = re.search(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}", page_text)
-    if m:
-        texts.append(m.group(0))
-
     for t in texts:
         try:
-            dt = dateparser.parse(t, fuzzy=True, tzinfos=TZINFOS)
+            dt = parse_date(t)
             return dt
         except Exception:
             continue
 
+    # last resort: first ISO timestamp anywhere in the raw markup (no page-text build)
+    m = ISO_TS_RE.search(html)
+    if m:
+        try:
+            return parse_date(m.group(0))
+        except Exception:
+            pass
+
     parsed = urlparse(url)
     m = re.search(r"/(\d{4})/(\d{2})/(\d{2})/", parsed.path)
     if m:
         try:
-            dt = dateparser.parse(f"{m.group(1)}-{m.group(2)}-{m.group(3)}", fuzzy=True)
+            dt = parse_date(f"{m.group(1)}-{m.group(2)}-{m.group(3)}")
             return dt
         except Exception:
             pass
@@ -289,36 +409,37 @@ def parse_published_generic(soup, url):
     return None
 
 # ---------- Site-specific scrapers ----------
-def scrape_cnn(session, url):
-    r = fetch_url(session, url)
-    if not r: return None
-    soup = BeautifulSoup(r.text, "lxml")
+CNN_SELS = [css(sel) for sel in ["div.l-container article p", "div.pg-rail-tall__body p", "article p", "div.zn-body__paragraph"]]
 
-    title = extract_title_generic(soup)
+def scrape_cnn(html, url):
+    tree = parse_html(html)
+
+    title = extract_title_generic(tree)
 
-    selectors = ["div.l-container article p", "div.pg-rail-tall__body p", "article p", "div.zn-body__paragraph"]
     paras = []
-    for sel in selectors:
-        for p in soup.select(sel):
-            txt = p.get_text(" ", strip=True)
+    for sel in CNN_SELS:
+        for p in sel(tree):
+            txt = node_text(p)
             if txt: paras.append(txt)
         if len(paras) >= 4:
             break
     if not paras:
-        paras = extract_paragraphs_from_el(soup.select_one("article")) if soup.select_one("article") else []
+        paras = extract_paragraphs_from_el(select_one(tree, ARTICLE_SEL))
 
     body = " ".join(paras).strip()
     if len(body) < 150: return None
 
     published = None
-    meta = soup.find("meta", attrs={"itemprop":"datePublished"}) or soup.find("meta", attrs={"name":"pubdate"})
-    if meta and meta.get("content"):
+    meta = find_meta(tree, "itemprop", "datePublished")
+    if meta is None:
+        meta = find_meta(tree, "name", "pubdate")
+    if meta is not None and meta.get("content"):
         published = meta.get("content")
     else:
-        t = soup.find("meta", property="article:published_time")
-        if t and t.get("content"):
+        t = find_meta(tree, "property", "article:published_time")
+        if t is not None and t.get("content"):
             published = t.get("content")
-    published_norm = normalize_date_to_mysql(published) if published else normalize_date_to_mysql(parse_published_generic(soup, url))
+    published_norm = normalize_date_to_mysql(published) if published else normalize_date_to_mysql(parse_published_generic(tree, url, html))
 
     lang = "en"
     return {
@@ -326,90 +447,94 @@ def scrape_cnn(session, url):
         "length": len(body), "source": normalize_domain(url), "language": lang
     }
 
-def scrape_bbc(session, url):
-    r = fetch_url(session, url)
-    if not r: return None
-    soup = BeautifulSoup(r.text, "lxml")
+BBC_P_SEL = css("article p, .ssrcss-uf6wea-RichTextComponentWrapper p, .story-body__inner p")
+
+def scrape_bbc(html, url):
+    tree = parse_html(html)
 
-    title = extract_title_generic(soup)
+    title = extract_title_generic(tree)
     # BBC article p tags often within article or .ssrcss-*
-    paras = [p.get_text(" ", strip=True) for p in soup.select("article p, .ssrcss-uf6wea-RichTextComponentWrapper p, .story-body__inner p")]
+    paras = [node_text(p) for p in BBC_P_SEL(tree)]
     paras = [p for p in paras if p and len(p) > 40]
     body = " ".join(paras).strip()
     if len(body) < 150: return None
 
     # time tag
-    time_tag = soup.find("time")
-    published = time_tag.get("datetime") if time_tag and time_tag.get("datetime") else None
-    published_norm = normalize_date_to_mysql(published) if published else normalize_date_to_mysql(parse_published_generic(soup, url))
+    time_tag = first(TIME_XPATH(tree))
+    published = time_tag.get("datetime") if time_tag is not None and time_tag.get("datetime") else None
+    published_norm = normalize_date_to_mysql(published) if published else normalize_date_to_mysql(parse_published_generic(tree, url, html))
 
     lang = "en"
     return {"url": url, "title": title, "body": body, "published": published_norm, "length": len(body), "source": normalize_domain(url), "language": lang}
 
-def scrape_nytimes(session, url):
-    r = fetch_url(session, url)
-    if not r: return None
-    soup = BeautifulSoup(r.text, "lxml")
-    title = extract_title_generic(soup)
+NYT_P_SEL = css("section[name='articleBody'] p, .css-53u6y8 p, article p")
+
+def scrape_nytimes(html, url):
+    tree = parse_html(html)
+    title = extract_title_generic(tree)
     # NYT article paragraphs often in section[name="articleBody"] p or div[class*='StoryBodyCompanionColumn'] p
-    paras = [p.get_text(" ", strip=True) for p in soup.select("section[name='articleBody'] p, .css-53u6y8 p, article p")]
+    paras = [node_text(p) for p in NYT_P_SEL(tree)]
     paras = [p for p in paras if p and len(p) > 30]
     body = " ".join(paras).strip()
     if len(body) < 150: return None
     # published
-    meta = soup.find("meta", attrs={"name":"ptime"}) or soup.find("meta", attrs={"property":"article:published"})
+    meta = find_meta(tree, "name", "ptime")
+    if meta is None:
+        meta = find_meta(tree, "property", "article:published")
     published = None
-    if meta and meta.get("content"):
+    if meta is not None and meta.get("content"):
         published = meta.get("content")
     else:
-        time_tag = soup.find("time")
-        published = time_tag.get("datetime") if time_tag and time_tag.get("datetime") else None
-    published_norm = normalize_date_to_mysql(published) if published else normalize_date_to_mysql(parse_published_generic(soup, url))
+        time_tag = first(TIME_XPATH(tree))
+        published = time_tag.get("datetime") if time_tag is not None and time_tag.get("datetime") else None
+    published_norm = normalize_date_to_mysql(published) if published else normalize_date_to_mysql(parse_published_generic(tree, url, html))
     lang = "en"
     return {"url": url, "title": title, "body": body, "published": published_norm, "length": len(body), "source": normalize_domain(url), "language": lang}
 
-def scrape_guardian(session, url):
-    r = fetch_url(session, url)
-    if not r: return None
-    soup = BeautifulSoup(r.text, "lxml")
-    title = extract_title_generic(soup)
-    paras = [p.get_text(" ", strip=True) for p in soup.select("div[itemprop='articleBody'] p, article p, .content__article-body p")]
+GUARDIAN_P_SEL = css("div[itemprop='articleBody'] p, article p, .content__article-body p")
+
+def scrape_guardian(html, url):
+    tree = parse_html(html)
+    title = extract_title_generic(tree)
+    paras = [node_text(p) for p in GUARDIAN_P_SEL(tree)]
     paras = [p for p in paras if p and len(p) > 30]
     body = " ".join(paras).strip()
     if len(body) < 150: return None
-    time_tag = soup.find("time")
-    published = time_tag.get("datetime") if time_tag and time_tag.get("datetime") else None
-    published_norm = normalize_date_to_mysql(published) if published else normalize_date_to_mysql(parse_published_generic(soup, url))
+    time_tag = first(TIME_XPATH(tree))
+    published = time_tag.get("datetime") if time_tag is not None and time_tag.get("datetime") else None
+    published_norm = normalize_date_to_mysql(published) if published else normalize_date_to_mysql(parse_published_generic(tree, url, html))
     lang = "en"
     return {"url": url, "title": title, "body": body, "published": published_norm, "length": len(body), "source": normalize_domain(url), "language": lang}
 
-def scrape_reuters(session, url):
-    r = fetch_url(session, url)
-    if not r: return None
-    soup = BeautifulSoup(r.text, "lxml")
-    title = extract_title_generic(soup)
-    paras = [p.get_text(" ", strip=True) for p in soup.select("div.ArticleBodyWrapper p, .article-body__content p, .StandardArticleBody_body p, article p")]
+REUTERS_P_SEL = css("div.ArticleBodyWrapper p, .article-body__content p, .StandardArticleBody_body p, article p")
+
+def scrape_reuters(html, url):
+    tree = parse_html(html)
+    title = extract_title_generic(tree)
+    paras = [node_text(p) for p in REUTERS_P_SEL(tree)]
     paras = [p for p in paras if p and len(p) > 30]
     body = " ".join(paras).strip()
     if len(body) < 150: return None
-    t = soup.find("meta", {"property":"article:published_time"}) or soup.find("time")
-    published = t.get("content") if t and t.get("content") else (t.get("datetime") if t and t.get("datetime") else None)
-    published_norm = normalize_date_to_mysql(published) if published else normalize_date_to_mysql(parse_published_generic(soup, url))
+    t = find_meta(tree, "property", "article:published_time")
+    if t is None:
+        t = first(TIME_XPATH(tree))
+    published = t.get("content") if t is not None and t.get("content") else (t.get("datetime") if t is not None and t.get("datetime") else None)
+    published_norm = normalize_date_to_mysql(published) if published else normalize_date_to_mysql(parse_published_generic(tree, url, html))
     lang = "en"
     return {"url": url, "title": title, "body": body, "published": published_norm, "length": len(body), "source": normalize_domain(url), "language": lang}
 
-def scrape_aljazeera(session, url):
-    r = fetch_url(session, url)
-    if not r: return None
-    soup = BeautifulSoup(r.text, "lxml")
-    title = extract_title_generic(soup)
-    paras = [p.get_text(" ", strip=True) for p in soup.select("div.wysiwyg p, article p")]
+ALJAZEERA_P_SEL = css("div.wysiwyg p, article p")
+
+def scrape_aljazeera(html, url):
+    tree = parse_html(html)
+    title = extract_title_generic(tree)
+    paras = [node_text(p) for p in ALJAZEERA_P_SEL(tree)]
     paras = [p for p in paras if p and len(p) > 30]
     body = " ".join(paras).strip()
     if len(body) < 150: return None
-    time_tag = soup.find("time")
-    published = time_tag.get("datetime") if time_tag and time_tag.get("datetime") else None
-    published_norm = normalize_date_to_mysql(published) if published else normalize_date_to_mysql(parse_published_generic(soup, url))
+    time_tag = first(TIME_XPATH(tree))
+    published = time_tag.get("datetime") if time_tag is not None and time_tag.get("datetime") else None
+    published_norm = normalize_date_to_mysql(published) if published else normalize_date_to_mysql(parse_published_generic(tree, url, html))
     lang = "ar" if "aljazeera.net" in normalize_domain(url) and "/arabic" in url else "en"
     return {"url": url, "title": title, "body": body, "published": published_norm, "length": len(body), "source": normalize_domain(url), "language": lang}
 
@@ -422,34 +547,42 @@ SITE_SCRAPERS = {
     "aljazeera.net": scrape_aljazeera
 }
 
-def extract_article(session, url):
+async def extract_article(session, pool, url):
+    html = await fetch_url(session, url)
+    if not html:
+        return None
+    loop = asyncio.get_running_loop()
     domain = normalize_domain(url)
     for key, fn in SITE_SCRAPERS.items():
         if key in domain:
             try:
-                return fn(session, url)
+                return await loop.run_in_executor(pool, fn, html, url)
             except Exception:
                 logging.exception("Site-specific scraper failed for %s", url)
                 return None
-    # fallback
-    return extract_article_generic(session, url)
+    # fallback; a failure here must not sink the other links gathered alongside it
+    try:
+        return await loop.run_in_executor(pool, extract_article_generic, html, url)
+    except Exception:
+        logging.exception("Generic extractor failed for %s", url)
+        return None
 
 # ---------- Link collection (homepage) ----------
 def is_probable_article(href, anchor_text=""):
     if not href:
         return False
     href_l = href.lower()
-    if BAD_EXT_RE.match(href_l) or any(b in href_l for b in BAD_SUBSTRINGS):
+    if BAD_EXT_RE.match(href_l) or BAD_SUBSTR_RE.search(href_l):
         return False
     parsed = urlparse(href_l)
     path = parsed.path or ""
-    if any(seg in path for seg in SECTION_HINTS):
+    if SECTION_RE.search(path):
         return False
     if path.endswith("/") and path.count("/") <= 3:
         return False
-    if re.search(r"/\d{4}/\d{2}/\d{2}/", path):
+    if DATE_PATH_RE.search(path):
         return True
-    if any(k in href_l for k in POSITIVE_SIGNS):
+    if POSITIVE_RE.search(href_l):
         return True
     if path.count("-") >= 2 and len(path) > 25:
         return True
@@ -457,67 +590,57 @@ def is_probable_article(href, anchor_text=""):
         return True
     return False
 
-def collect_article_links(session, site_url, limit=12):
-    r = fetch_url(session, site_url)
-    if not r:
+async def collect_article_links(session, pool, site_url, limit=12):
+    html = await fetch_url(session, site_url)
+    if not html:
         logging.warning("Failed to fetch homepage %s", site_url)
         return []
-    soup = BeautifulSoup(r.text, "lxml")
-    links = []
-    seen = set()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, find_article_links, html, site_url, limit)
+
+def find_article_links(html, site_url, limit=12):
+    """Rank every anchor in one pass: headlines, then promo/card links, then any
+    probable article, then long hyphenated slugs as a last resort"""
+    tree = parse_html(html)
+
+    # 1) first link inside each h1/h2  2) promo/card selectors (common)
+    headline = set()
+    for tag in HEADLINE_XPATH(tree):
+        a = first(A_HREF_XPATH(tag))
+        if a is not None:
+            headline.add(a)
+    promo = {}
+    for a in PROMO_LINK_SEL(tree):
+        classes = (a.get("class") or "").split()
+        promo[a] = 0 if "card" in classes else 1 if "promo" in classes else 2
 
-    # 1) headlines inside h1/h2
-    for tag in soup.find_all(["h1", "h2"]):
-        a = tag.find("a", href=True)
-        if not a:
-            continue
-        full = urljoin(site_url, a["href"])
-        if full in seen:
-            continue
-        if is_probable_article(full, a.get_text(" ", strip=True)):
-            seen.add(full); links.append(full)
-            if len(links) >= limit:
-                return links
-
-    # 2) promo/card selectors (common)
-    selectors = ["a.card", "a.promo", ".headline a", "a[href]"]
-    for sel in selectors:
-        for a in soup.select(sel):
-            href = a.get("href")
-            if not href:
-                continue
-            full = urljoin(site_url, href)
-            if full in seen:
+    candidates = []
+    for order, a in enumerate(A_HREF_XPATH(tree)):
+        full = urljoin(site_url, a.get("href"))
+        if is_probable_article(full, node_text(a)):
+            if a in headline:
+                rank = (0, 0)
+            elif a in promo:
+                rank = (1, promo[a])
+            else:
+                rank = (2, 0)
+        else:
+            # 4) final fallback: long hyphen slugs
+            path = urlparse(full).path
+            if not (path and path.count("-") >= 2 and len(path) > 25):
                 continue
-            txt = a.get_text(" ", strip=True)
-            if is_probable_article(full, txt):
-                seen.add(full); links.append(full)
-                if len(links) >= limit:
-                    return links
-
-    # 3) fallback: all anchors
-    for a in soup.find_all("a", href=True):
-        full = urljoin(site_url, a["href"])
+            rank = (3, 0)
+        candidates.append((rank, order, full))
+    candidates.sort()
+
+    links = []
+    seen = set()
+    for _, _, full in candidates:
         if full in seen:
             continue
-        txt = a.get_text(" ", strip=True)
-        if is_probable_article(full, txt):
-            seen.add(full); links.append(full)
-            if len(links) >= limit:
-                return links
-
-    # 4) final fallback: long hyphen slugs
-    if len(links) < limit:
-        for a in soup.find_all("a", href=True):
-            full = urljoin(site_url, a["href"])
-            if full in seen:
-                continue
-            path = urlparse(full).path
-            if path and path.count("-") >= 2 and len(path) > 25:
-                seen.add(full); links.append(full)
-                if len(links) >= limit:
-                    break
-
+        seen.add(full); links.append(full)
+        if len(links) >= limit:
+            break
     return links
 
 # ---------- DB helpers ----------
@@ -531,16 +654,24 @@ def ensure_table(cursor):
             published DATETIME NULL,
             length INT,
             source VARCHAR(255),
-            language VARCHAR(20)
+            language VARCHAR(20),
+            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            INDEX idx_articles_lang_id (language, id DESC)
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
     """)
 
+@functools.lru_cache(maxsize=1)
+def get_db_pool():
+    """Connection pool reused by every scheduled run (created on first save)"""
+    # the pool reconnects connections the server dropped between daily runs
+    return pooling.MySQLConnectionPool(pool_name="insightbot_scraper", pool_size=2, **DB_CONFIG)
+
 def save_to_mysql_batch(records):
     if not records:
         logging.info("No records to save")
         return
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
+        conn = get_db_pool().get_connection()
         cursor = conn.cursor()
         ensure_table(cursor)
 
@@ -567,6 +698,8 @@ def save_to_mysql_batch(records):
           source=VALUES(source),
           language=VALUES(language)
         """
+        # the connector rewrites an INSERT ... VALUES executemany into a single
+        # multi-row statement, so the whole batch is one round-trip
         cursor.executemany(sql, rows)
         conn.commit()
         logging.info("Inserted/updated %d rows into articles table", cursor.rowcount)
@@ -579,51 +712,84 @@ def save_to_mysql_batch(records):
         except Exception:
             pass
 
+def url_key(url):
+    """Compact fixed-size key used to remember scraped URLs"""
+    return hashlib.blake2b(url.encode(), digest_size=8).digest()
+
+def load_scraped_urls():
+    """Keys of every article URL already saved, so a run only fetches new links"""
+    keys = set()
+    try:
+        conn = get_db_pool().get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT url FROM articles")
+        for (url,) in cursor:
+            keys.add(url_key(url))
+        logging.info("Loaded %d already-scraped URLs", len(keys))
+    except Exception as e:
+        logging.warning("Could not load scraped URLs, fetching every link: %s", e)
+    finally:
+        try:
+            cursor.close()
+            conn.close()
+        except Exception:
+            pass
+    return keys
+
 # ---------- Main scraping loop ----------
-def scrape_all(sites, per_site_limit=6, pause=(1.0, 2.0)):
-    session = requests.Session()
+async def scrape_site(session, pool, site, per_site_limit, pause, known):
+    logging.info("SITE: %s", site)
     results = []
-    for site in sites:
-        logging.info("SITE: %s", site)
-        try:
-            candidate_links = collect_article_links(session, site, limit=per_site_limit * 8)
-            if not candidate_links:
-                logging.warning("No candidate links found for %s", site)
-            extracted = 0
-            for link in candidate_links:
-                if extracted >= per_site_limit:
-                    break
+    try:
+        candidate_links = await collect_article_links(session, pool, site, limit=per_site_limit * 8)
+        if not candidate_links:
+            logging.warning("No candidate links found for %s", site)
+        # links saved by an earlier run are never fetched again
+        pending = [link for link in candidate_links if url_key(link) not in known]
+        if len(pending) < len(candidate_links):
+            logging.info("Skipping %d already-scraped links for %s", len(candidate_links) - len(pending), site)
+        # fetch only as many links at once as we still need, so a site is never hammered
+        while pending and len(results) < per_site_limit:
+            need = per_site_limit - len(results)
+            batch, pending = pending[:need], pending[need:]
+            for link in batch:
                 logging.info(" -> trying: %s", link)
-                art = extract_article(session, link)
+            arts = await asyncio.gather(*(extract_article(session, pool, link) for link in batch))
+            for link, art in zip(batch, arts):
                 if art:
-                    # ensure published normalized if not already (site-specific scrapers generally return normalized)
-                    if art.get("published") and not isinstance(art.get("published"), str):
-                        art["published"] = normalize_date_to_mysql(art.get("published"))
-                    elif art.get("published") and isinstance(art.get("published"), str):
-                        # try to normalize string
-                        art["published"] = normalize_date_to_mysql(art.get("published"))
-                    else:
+                    # ensure published normalized if not already (every extractor returns normalized)
+                    published = art.get("published")
+                    if not published:
                         art["published"] = None
-
-                    # language detection if missing
-                    if not art.get("language") or art.get("language") == "unknown":
-                        try:
-                            art["language"] = detect(art.get("body") or "")
-                        except Exception:
-                            art["language"] = "unknown"
+                    elif not (isinstance(published, str) and MYSQL_DT_RE.fullmatch(published)):
+                        art["published"] = normalize_date_to_mysql(published)
 
                     results.append(art)
-                    extracted += 1
                     logging.info("   ✓ extracted (len=%d) %s", art["length"], link)
                 else:
                     logging.info("   ✗ skipped %s", link)
-                time.sleep(random.uniform(*pause))
-            if extracted == 0:
-                logging.warning("Extracted 0 articles for %s", site)
-        except Exception as e:
-            logging.exception("Error scraping site %s: %s", site, e)
+            await asyncio.sleep(random.uniform(*pause))
+        if not results:
+            logging.warning("Extracted 0 articles for %s", site)
+    except Exception as e:
+        logging.exception("Error scraping site %s: %s", site, e)
     return results
 
+async def scrape_all(sites, per_site_limit=6, pause=(1.0, 2.0), known=frozenset()):
+    # Sites are scraped concurrently; network waits overlap while HTML parsing
+    # runs in worker processes.
+    with ProcessPoolExecutor() as pool:
+        async with make_session() as session:
+            per_site = await asyncio.gather(
+                *(scrape_site(session, pool, site, per_site_limit, pause, known) for site in sites))
+    articles = [art for arts in per_site for art in arts]
+
+    # language detection if missing, batched over every article of the run
+    missing = [art for art in articles if not art.get("language") or art.get("language") == "unknown"]
+    for art, lang in zip(missing, detect_languages([art.get("body") or "" for art in missing])):
+        art["language"] = lang
+    return articles
+
 # ---------- CLI Entrypoint ----------
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -641,15 +807,17 @@ if __name__ == "__main__":
 
     def run_scraper():
         logging.info("Starting scraper (mode=%s, per-site=%d)", args.mode, args.per_site)
-        articles = scrape_all(sites, per_site_limit=args.per_site)
+        articles = asyncio.run(scrape_all(sites, per_site_limit=args.per_site, known=load_scraped_urls()))
 
         if articles:
-            df = pd.DataFrame(articles)
-            df = df[["url", "title", "body", "published", "length", "source", "language"]]
-            df.to_csv(out_csv, index=False)
-            with open(out_json, "w", encoding="utf-8") as f:
+            with open(out_csv, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=["url", "title", "body", "published", "length", "source", "language"],
+                                        extrasaction="ignore", lineterminator="\n")
+                writer.writeheader()
+                writer.writerows(articles)
+            with open(out_json, "wb") as f:
                 for rec in articles:
-                    f.write(json.dumps(rec, ensure_ascii=False, default=str) + "\n")
+                    f.write(orjson.dumps(rec, default=str, option=orjson.OPT_APPEND_NEWLINE))
             logging.info("Saved %d articles to %s and %s", len(articles), out_csv, out_json)
 
             # Save to MySQL
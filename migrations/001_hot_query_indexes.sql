@@ -0,0 +1,14 @@
+-- Indexes for the hot queries in app.py. Run once against an existing database:
+--   mysql -u root insightbot < migrations/001_hot_query_indexes.sql
+-- (articles tables created by a current scraper already have idx_articles_lang_id;
+--  skip that statement there.)
+
+-- login / register: WHERE username = %s, and the atomic insert in register() relies on it
+CREATE UNIQUE INDEX idx_users_username ON users (username);
+
+-- admin_approve: WHERE is_approved = FALSE
+CREATE INDEX idx_users_is_approved ON users (is_approved);
+
+-- index(): WHERE language = %s ORDER BY id DESC, plus the DISTINCT language facet.
+-- articles.id is the InnoDB primary key, so rows are already clustered by id.
+CREATE INDEX idx_articles_lang_id ON articles (language, id DESC);
@@ -0,0 +1,7 @@
+-- Change tracking for /api/articles (ETag / Last-Modified). Run once against an existing database:
+--   mysql -u root insightbot < migrations/002_articles_updated_at.sql
+-- (articles tables created by a current scraper already have updated_at; skip this there.)
+
+-- _articles_version() in app.py reads MAX(updated_at); upserts from the scraper bump it
+ALTER TABLE articles ADD COLUMN updated_at TIMESTAMP NOT NULL
+    DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP;